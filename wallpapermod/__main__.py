@@ -1,8 +1,6 @@
 from logging.config import dictConfig
 
 from .config import CLIConfig
-from .const import *
-from .database import *
 
 
 if __name__ == "__main__":
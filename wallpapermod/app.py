@@ -0,0 +1,640 @@
+import atexit, base64, concurrent.futures, datetime, functools, io, itertools, logging, pathlib, sys, typing as t
+
+import lxml.html
+import praw
+from PIL import Image as PImage, UnidentifiedImageError
+import requests
+import urllib3
+
+try:
+    import colorama
+except ImportError:
+    colorama = None
+
+from .config import Config
+from .const import *
+from .database import *
+from .exceptions import *
+from .external_links.imgur import Imgur
+from .external_links.flickr import Flickr
+from .logging_ import PrefixAdapter
+from .responses import get_responder
+from .util import count, read_json, write_json
+from . import __version__
+
+
+_MAX_RESULT_LENGTH = max(len(x.value) for x in PostResult.__members__.values())
+
+# Each successive element has higher priority than the last, i.e. ImageResult.SMALLER trumps all.
+_IMAGE_RESULT_PRIORITY = {
+    ImageResult.VALID: 0,
+    ImageResult.LARGER: 1,
+    ImageResult.UNSUPPORTED_MEDIA_TYPE: 2,
+    ImageResult.SMALLER: 3,
+}
+
+_IMAGE_TO_POST_RESULT = {result: PostResult(result.value) for result in ImageResult}
+
+# (Symbol, color) to log for each result; anything else is ("X", "red")
+_RESULT_DISPLAY = {
+    PostResult.MODPOST: ("M", "blue"),
+    PostResult.VALID: ("\u221A", "green"),  # Square root symbol
+    PostResult.LARGER: ("!", "yellow"),
+    PostResult.UNSUPPORTED_MEDIA_TYPE: ("?", "white"),
+}
+
+# Tables on the resolutions wiki page whose header row reads (Width, Height, Description), case-insensitively
+_REZZES_TABLE_XPATH = """
+    //table[thead/tr[
+        contains(translate(string(*[1]), 'WIDTH', 'width'), 'width')
+        and contains(translate(string(*[2]), 'HEIGHT', 'height'), 'height')
+        and contains(translate(string(*[3]), 'DESCRIPTION', 'description'), 'description')
+    ]]
+"""
+
+_colorama_initted = False
+
+
+def _init_colorama():
+    global _colorama_initted
+    if colorama is not None and not _colorama_initted:
+        colorama.init()
+        _colorama_initted = True
+
+
+class App:
+    def __init__(self, config: Config, log: logging.Logger = None):
+        self.config = config
+        self.log = log or logging.getLogger("app")
+        # Checked submissions waiting to be written by save()
+        self._unsaved = list[Submission]()
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            # Hand the last response back once retries run out, so PRAW can deal with it as usual
+            max_retries=urllib3.Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        atexit.register(self.session.close)
+        author = base64.b64decode(b"ZG9vbWJveTEwMDA=").decode("utf-8")
+        user_agent = f"script:{APP_NAME}:v{__version__} (Python {sys.version}) (by /u/{author})"
+        self.session.headers.update({"User-Agent": user_agent})
+        self.log.info("Initializing connection to reddit")
+        self.reddit = self.make_praw(
+            self.config.reddit_username,
+            self.config.reddit_password,
+            self.config.reddit_client_id,
+            self.config.reddit_client_secret,
+            self.session,
+            **self.config.praw_config or {},
+        )
+        self.subreddit: praw.reddit.Subreddit = self.reddit.subreddit(self.config.subreddit)
+        self.moderators = self.get_moderators()
+        self.responder = get_responder(self.config.subreddit)
+        self.log.info(f"Reddit initialized read-only={self.reddit.read_only}")
+        self.rezzes = self.get_rezzes()
+        if self.config.color:
+            _init_colorama()
+
+    @functools.cached_property
+    def imgur(self) -> Imgur:
+        return Imgur(self.config.imgur_client_id, self.session)
+
+    @functools.cached_property
+    def flickr(self) -> Flickr:
+        return Flickr(self.config.flickr_key, self.session)
+
+    def colored(self, color: str, msg: t.Any) -> str:
+        msg = str(msg)
+        if not self.config.color or colorama is None:
+            return msg
+
+        return getattr(colorama.Fore, color.upper(), "") + msg + colorama.Style.RESET_ALL
+
+    def get_rezzes(self) -> frozenset[Resolution]:
+        """
+        Read the HTML of <https://www.reddit.com/r/wallpaper/wiki/resolutions>
+        and return the set of supported resolutions
+
+        The parsed set is cached next to the database. The wiki page is only fetched again once
+        the cache is older than REZZES_CACHE_TTL, and only re-parsed if it has been revised since.
+        """
+        cache = self._read_cache(REZZES_CACHE_NAME, "rezzes")
+        if cache is not None and cache["age"] < REZZES_CACHE_TTL:
+            self.log.debug("Using cached resolutions")
+            return frozenset((w, h) for w, h in cache["rezzes"])
+
+        page = self.subreddit.wiki["resolutions"]
+        if cache is not None and cache.get("revision") == page.revision_date:
+            self.log.debug(f"Wiki page {page!s} unchanged since last fetch")
+            rezzes = frozenset((w, h) for w, h in cache["rezzes"])
+        else:
+            rezzes = self._parse_rezzes(page)
+
+        self._write_cache(REZZES_CACHE_NAME, revision=page.revision_date, rezzes=sorted(rezzes))
+        return rezzes
+
+    def get_moderators(self) -> frozenset[str]:
+        """
+        Return the names of the subreddit's moderators,
+        cached next to the database for MODERATORS_CACHE_TTL
+        """
+        cache = self._read_cache(MODERATORS_CACHE_NAME, "moderators")
+        if cache is not None and cache["age"] < MODERATORS_CACHE_TTL:
+            self.log.debug("Using cached moderators")
+            return frozenset(cache["moderators"])
+
+        moderators = frozenset(x.name for x in self.subreddit.moderator())
+        self._write_cache(MODERATORS_CACHE_NAME, moderators=sorted(moderators))
+        return moderators
+
+    def _read_cache(self, name: str, key: str) -> t.Optional[dict[str, t.Any]]:
+        """
+        Read a cache file written by _write_cache, adding its "age".
+        Returns None if it doesn't exist, belongs to another subreddit, is missing `key` or has
+        no valid timestamp.
+        """
+        cache = read_json(pathlib.Path(self.config.database).with_name(name))
+        if not isinstance(cache, dict) or cache.get("subreddit") != self.config.subreddit:
+            return None
+        if key not in cache:
+            return None
+        try:
+            fetched_at = datetime.datetime.fromisoformat(cache["fetched_at"])
+            cache["age"] = datetime.datetime.now(tz=datetime.timezone.utc) - fetched_at
+        except (KeyError, TypeError, ValueError):
+            return None
+        return cache
+
+    def _write_cache(self, name: str, **data):
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        write_json(
+            pathlib.Path(self.config.database).with_name(name),
+            {"subreddit": self.config.subreddit, "fetched_at": now.isoformat(), **data},
+        )
+
+    @staticmethod
+    def _parse_rezzes(page: praw.reddit.models.WikiPage) -> frozenset[Resolution]:
+        root = lxml.html.fromstring(page.content_html)
+        tables = root.xpath(_REZZES_TABLE_XPATH)
+        if not tables:
+            raise ValueError(
+                f"Unable to find a table with the appropriate (Width,Height,Description) headers on Wiki page {page!s}"
+            )
+
+        rezzes = list[Resolution]()
+        for tr in tables[0].xpath("tbody/tr"):
+            width = int(tr.xpath("string(*[1])"))
+            height = int(tr.xpath("string(*[2])"))
+            rezzes.append((width, height))
+
+        return frozenset(rezzes)
+
+    def run(self):
+        self.init_db()
+
+        if self.config.posts:
+            self._run_specific(*self.config.posts)
+            return
+
+        self._run_loop()
+        return
+
+    def init_db(self):
+        DB.configure(self.config.database)
+        db_filepath = pathlib.Path(self.config.database)
+        if not db_filepath.parent.exists():
+            db_filepath.parent.mkdir(parents=True, exist_ok=True)
+        if self.config.drop:
+            self.log.info(f"Dropping and recreating database {self.config.database!r}")
+            drop_all()
+        create_all()
+
+    def _run_loop(self):
+        msg: str
+        if self.config.count:
+            count_str = count(self.config.count, "post")
+            msg = f"Beginning retrieval of {count_str}"
+        else:
+            msg = "Beginning maximum retrieval of posts"
+
+        if self.config.stop_after:
+            if isinstance(self.config.stop_after, str):
+                msg += f", stopping after post {self.config.stop_after!r}"
+            elif isinstance(self.config.stop_after, datetime.datetime):
+                msg += f", stopping after {self.config.stop_after}"
+            else:
+                raise ValueError(f"Unknown stop-after value {self.config.stop_after!r}")
+
+        self.log.info(msg)
+
+        # One query up front instead of an existence check per post
+        processed = dict(DB.query(Submission.postID, Submission.dateProcessed))
+        try:
+            # With a count, PRAW requests no more than that per listing page and stops on its own
+            for i, post in enumerate(self.subreddit.new(limit=self.config.count or None)):
+                if isinstance(self.config.stop_after, datetime.datetime):
+                    # Break if the post submission time is less than the config
+                    if post.created <= self.config.stop_after.timestamp():
+                        break
+                self.check_submission(post, processed)
+                if (i + 1) % COMMIT_INTERVAL == 0:
+                    self.save()
+                if isinstance(self.config.stop_after, str):
+                    # Break if the post ID matches config
+                    if post.id == self.config.stop_after:
+                        break
+        finally:
+            # Save partial progress too, e.g. on KeyboardInterrupt
+            self.save()
+
+        if self.config.count:
+            self.log.info(f"Finished retrieving {count_str}")
+
+        return
+
+    def _run_specific(self, *post_ids: str):
+        if not post_ids:
+            self.log.warning("No post IDs to check")
+            return
+        # Drop repeated IDs, keeping the order they were given in
+        post_ids = tuple(dict.fromkeys(post_ids))
+        if len(post_ids) == 1:
+            self.log.info("Will only check post with this ID: " + post_ids[0])
+        else:
+            self.log.info("Will only check posts with these IDs: " + ", ".join(post_ids))
+        processed = dict(
+            DB.query(Submission.postID, Submission.dateProcessed).filter(
+                Submission.postID.in_(post_ids)
+            )
+        )
+        self.log.info(f"Retrieving {count(post_ids, 'post')}")
+        # reddit.info fetches up to 100 posts per request, rather than one request per post
+        posts: t.Optional[dict[str, praw.reddit.Submission]]
+        try:
+            posts = {
+                post.id: post
+                for post in self.reddit.info(fullnames=[f"t3_{post_id}" for post_id in post_ids])
+            }
+        except Exception as exc:
+            self.log.error(f"Unable to retrieve posts in bulk, retrieving them one by one: {exc}")
+            posts = None
+        try:
+            for post_id in post_ids:
+                log = PrefixAdapter(self.log, f"{post_id:<7} -")
+                try:
+                    if posts is None:
+                        post = self.reddit.submission(id=post_id)
+                    else:
+                        post = posts.get(post_id)
+                    if post is None:
+                        raise PostNotFoundError(f"Post {post_id} not found")
+                    if post.subreddit.display_name != self.config.subreddit:
+                        raise WrongSubredditError(
+                            f"Post {post_id} is from /r/{post.subreddit.display_name}, expected /r/{self.config.subreddit}"
+                        )
+                except Exception as exc:
+                    log.error(str(exc))
+                else:
+                    self.check_submission(post, processed)
+        finally:
+            self.save()
+
+    def check_submission(
+        self,
+        post: praw.reddit.Submission,
+        processed: t.Optional[dict[str, datetime.datetime]] = None,
+    ):
+        """
+        `processed` maps the IDs of already-processed posts to when they were processed. It's
+        updated with this post; if omitted, the database is queried for this post alone.
+        The checked submission isn't written to the database until save() is called.
+
+        Standard output:
+        ```
+        YYYY-mm-dd HH:MM:SS,SSS - INFO    - [√] VALID               - https://www.reddit.com/r/wallpaper/comments/1a2b3c4d/title_here_1920x1080/
+        ```
+        Verbose output:
+        ```
+        YYYY-mm-dd HH:MM:SS,SSS - INFO    - 1a2b3c4d - Title: 'Title here [1920x1080]'
+        YYYY-mm-dd HH:MM:SS,SSS - INFO    - 1a2b3c4d - Submitted: YYYY-mm-dd HH:MM:SS
+        YYYY-mm-dd HH:MM:SS,SSS - INFO    - 1a2b3c4d - Domain: i.redd.it
+        YYYY-mm-dd HH:MM:SS,SSS - INFO    - 1a2b3c4d - Resolution (title): 1920x1080
+        YYYY-mm-dd HH:MM:SS,SSS - INFO    - 1a2b3c4d - Image submission
+        YYYY-mm-dd HH:MM:SS,SSS - INFO    - 1a2b3c4d - └─ Resolution (JPEG image): 1920x1080
+        YYYY-mm-dd HH:MM:SS,SSS - INFO    - 1a2b3c4d - [√] VALID
+        ```
+        """
+        log = PrefixAdapter(self.log, f"{post.id:<7} -")
+        # Don't build log messages that would only be discarded
+        log_info = log.isEnabledFor(logging.INFO)
+        verbose = log_info and self.config.verbose > 0
+
+        submission = Submission.from_post(post, self.rezzes)
+        dt_submitted = submission.dateSubmitted.astimezone().replace(tzinfo=None)
+        permalink = post._reddit.config.reddit_url + post.permalink
+        if verbose:
+            log.info(f"Title: {submission.title!r}")
+            log.info(f"Submitted: {dt_submitted:%Y-%m-%d %H:%M:%S}")
+            log.info(f"Domain: {submission.domain}")
+
+        if processed is None:
+            processed = {s.postID: s.dateProcessed for s in self._unsaved}
+            processed.update(
+                DB.query(Submission.postID, Submission.dateProcessed).filter(
+                    Submission.postID == submission.postID
+                )
+            )
+        if submission.postID in processed:
+            dt_processed = processed[submission.postID].astimezone().replace(tzinfo=None)
+            if verbose:
+                log.info(
+                    self.colored("blue", f"[\u2192] SKIPPED")
+                    + f" - Already processed on {dt_processed:%Y-%m-%d %H:%M:%S}"
+                )
+            elif log_info:
+                log.info(
+                    self.colored("blue", f"[\u2192] {'SKIPPED':<{_MAX_RESULT_LENGTH}}")
+                    + f" - {permalink}"
+                )
+            return
+
+        if submission.author in self.moderators:
+            submission.type = PostType.UNKNOWN
+            submission.result = PostResult.MODPOST
+        else:
+            try:
+                if not submission.res:
+                    raise PostResultError(PostResult.NO_RESOLUTION)
+                if not submission.good_rezzes:
+                    raise PostResultError(PostResult.UNSUPPORTED_RES)
+
+                image_urls, special_type = self.get_image_urls(post, log)
+
+                if verbose:
+                    rezzes_str = ", ".join(f"{x}×{y}" for x, y in submission.res)
+                    log.info(f"Resolution (title): {rezzes_str}")
+                if isinstance(image_urls, str):
+                    if verbose:
+                        logmsg = "Image submission"
+                        if special_type:
+                            logmsg += f" ({special_type})"
+                        log.info(logmsg)
+                    submission.type = PostType.IMAGE
+                    self.check_image(submission, image_urls, None, log)
+                else:
+                    if verbose:
+                        logmsg = "Gallery submission"
+                        if special_type:
+                            logmsg += f" ({special_type})"
+                        logmsg += f" ({count(image_urls, 'image')})"
+                        log.info(logmsg)
+                    submission.type = PostType.GALLERY
+                    num_images = len(image_urls)
+                    # Fetch the image headers concurrently, but check them (and log) in order
+                    with concurrent.futures.ThreadPoolExecutor(
+                        max_workers=min(GALLERY_WORKERS, num_images) or 1
+                    ) as executor:
+                        headers = list(executor.map(self._read_image_header, image_urls))
+                    for i, (image_url, header) in enumerate(zip(image_urls, headers)):
+                        self.check_image(submission, image_url, (i + 1) / num_images, log, header)
+            except PostResultError as exc:
+                submission.result = exc.postresult
+                submission.type = PostType.UNKNOWN
+            else:
+                result = max(
+                    (i.result for i in submission.images),
+                    key=_IMAGE_RESULT_PRIORITY.__getitem__,
+                    default=ImageResult.VALID,
+                )
+                submission.result = _IMAGE_TO_POST_RESULT[result]
+
+        submission.dateProcessed = datetime.datetime.now(tz=datetime.timezone.utc)
+
+        char, color = _RESULT_DISPLAY.get(submission.result, ("X", "red"))
+
+        self.respond(submission)
+        if verbose:
+            log.info(self.colored(color, f"[{char}] {submission.result.value}"))
+        elif log_info:
+            log.info(
+                self.colored(color, f"[{char}] {submission.result.value:<{_MAX_RESULT_LENGTH}}")
+                + f" - {permalink}"
+            )
+
+        self._unsaved.append(submission)
+        processed[submission.postID] = submission.dateProcessed
+
+    def save(self):
+        """
+        Write the submissions checked since the last save to the database, and commit
+        """
+        save_all(self._unsaved)
+        self._unsaved.clear()
+        DB.commit()
+
+    def respond(self, submission: Submission):
+        response_text = self.responder.make_response(submission)
+        if response_text is None:
+            # Don't do anything for any other results (i.e. VALID or unsupported things)
+            return
+
+        if submission.result in (
+            PostResult.NO_RESOLUTION,
+            PostResult.UNSUPPORTED_RES,
+            PostResult.SMALLER,
+        ):
+            # Add a comment, distinguish comment, sticky comment, remove the post
+            # submission.removed = True
+            pass
+        if submission.result is PostResult.LARGER:
+            # Add a comment, distinguish comment, sticky comment
+            pass
+
+        # TODO: Swap this out for a permalink of the stickied comment
+        # once commenting has been implemented
+        submission.response = response_text
+
+    def get_image_urls(
+        self, post: praw.reddit.Submission, log: logging.Logger = None
+    ) -> ImageURLCollection:
+        if log is None:
+            log = self.log
+
+        if hasattr(post, "crosspost_parent"):
+            _parent_kind, parent_id = post.crosspost_parent.split("_")
+            parent = self.reddit.submission(parent_id)
+            parent._fetch()
+            return self.get_image_urls(parent, log)
+
+        if getattr(post, "is_gallery", False):
+            # This is a gallery post
+            gallery_items = [i["media_id"] for i in post.gallery_data["items"]]
+            gallery_urls = list[str]()
+            for item in gallery_items:
+                media_item = post.media_metadata[item]
+                media_item_status = media_item.get("status")
+                if media_item_status != "valid":
+                    log.warn(f"Media item {item!r} has status {media_item_status!r}")
+                    continue
+                gallery_urls.append(media_item["s"]["u"])
+            return ImageURLCollection(gallery_urls)
+        elif getattr(post, "post_hint", None) == "image" or post.domain == "i.redd.it":
+            # This is a single image
+            return ImageURLCollection(post.url)
+        elif post.domain in ("imgur.com",):
+            urls = self.imgur.get_image_urls(post.url.strip())
+            return ImageURLCollection(urls, "Imgur")
+        elif post.domain in ("flickr.com",):
+            urls = self.flickr.get_image_urls(post.url.strip())
+            return ImageURLCollection(urls, "Flickr")
+        else:
+            log.debug(f"Unsupported link domain {post.domain!r}")
+            raise PostResultError(PostResult.UNSUPPORTED_TYPE_OR_LINK)
+
+    def check_image(
+        self,
+        submission: Submission,
+        image_url: str,
+        index_pct: t.Union[int, None] = None,
+        log: logging.Logger = None,
+        header: t.Optional[ImageHeader] = None,
+    ) -> Image:
+        if log is None:
+            log = self.log
+
+        if index_pct == 1.0 or index_pct is None:
+            log_prefix = "└─"
+            log_prefix_debug = "   └─"
+        else:
+            log_prefix = "├─"
+            log_prefix_debug = "│  └─"
+
+        if header is None:
+            header = self._read_image_header(image_url)
+
+        image = Image(postID=submission.postID, url=image_url)
+        submission.images.append(image)
+        if header.format is None:
+            image.result = ImageResult.UNSUPPORTED_MEDIA_TYPE
+            log.warning(f"{log_prefix} Unsupported MimeType {header.content_type!r}")
+            return image
+
+        image.x = header.width
+        image.y = header.height
+        image.format = header.format
+        image.result = ImageResult.VALID
+        if self.config.verbose > 0 and log.isEnabledFor(logging.INFO):
+            log.info(
+                f"{log_prefix} Resolution ({header.format} image): {header.width}×{header.height}"
+            )
+
+        # Oh no, we're going to have a mismatch of some sort
+        if (image.x, image.y) not in submission.good_rezzes:
+            # Image needs to be at least as big (in both dimensions) as ONE of the resolutions in the post title
+            if log.isEnabledFor(logging.DEBUG):
+                # Compare against every resolution so each comparison gets logged
+                satisfied = False
+                for x, y in submission.good_rezzes:
+                    if image.x >= x and image.y >= y:
+                        log.debug(
+                            f"{log_prefix_debug} Image ({image.x}×{image.y}) at least as big as title's ({x}×{y})"
+                        )
+                        satisfied = True
+                    else:
+                        log.debug(
+                            f"{log_prefix_debug} Image ({image.x}×{image.y}) is smaller than title's ({x}×{y})"
+                        )
+            else:
+                satisfied = any(image.x >= x and image.y >= y for x, y in submission.good_rezzes)
+            if satisfied:
+                image.result = ImageResult.LARGER
+            else:
+                image.result = ImageResult.SMALLER
+        else:
+            log.debug(f"{log_prefix_debug} Image ({image.x}×{image.y}) matches title resolution")
+
+        return image
+
+    def _read_image_header(self, image_url: str) -> ImageHeader:
+        """
+        Download just enough of an image to read its format and dimensions.
+        Safe to call from worker threads, since it doesn't touch the database.
+        """
+        data = bytearray()
+        # Ask for the start of the image first, and only for the rest of it if the header didn't fit.
+        # Servers that ignore Range send the whole image instead, which is read the same way.
+        first_range = {"Range": f"bytes=0-{IMAGE_RANGE_BYTES - 1}"}
+        with self.session.get(image_url, stream=True, headers=first_range) as image_resp:
+            content_type = image_resp.headers.get("Content-Type")
+            partial = image_resp.status_code == 206
+            header = self._parse_image_stream(image_resp, data, content_type)
+            if header is not None and partial:
+                # Read the rest of the range so the connection goes back to the pool
+                image_resp.raw.drain_conn()
+
+        if header is None and partial and len(data) == IMAGE_RANGE_BYTES:
+            rest_range = {"Range": f"bytes={len(data)}-"}
+            with self.session.get(image_url, stream=True, headers=rest_range) as image_resp:
+                if image_resp.status_code == 206:
+                    header = self._parse_image_stream(image_resp, data, content_type)
+
+        return header or ImageHeader(content_type)
+
+    @staticmethod
+    def _parse_image_stream(
+        image_resp: requests.Response, data: bytearray, content_type: t.Optional[str]
+    ) -> t.Optional[ImageHeader]:
+        """
+        Append the response body to data until PIL can read an image header from it.
+        Returns None if it never could
+        """
+        attempt_at = max(IMAGE_CHUNK_BYTES, 2 * len(data))
+        for chunk in itertools.chain(image_resp.iter_content(IMAGE_CHUNK_BYTES), [b""]):
+            data += chunk
+            # Try to parse whenever the amount read doubles, and once more at the end
+            if chunk and len(data) < attempt_at:
+                continue
+            attempt_at = 2 * len(data)
+            try:
+                pimage = PImage.open(io.BytesIO(data), formats=SUPPORTED_FORMATS)
+            except UnidentifiedImageError:
+                # Most likely not a supported image at all, so don't download too much of it
+                if len(data) >= IMAGE_HEADER_MAX_BYTES:
+                    return None
+            except OSError:
+                # A supported format whose header hasn't all arrived yet (WebP needs the whole file)
+                continue
+            else:
+                return ImageHeader(content_type, pimage.format, *pimage.size)
+
+        return None
+
+    @staticmethod
+    def make_praw(
+        username: str,
+        password: str,
+        client_id: str,
+        client_secret: str,
+        session: requests.Session,
+        **kwargs,
+    ) -> praw.Reddit:
+        config = dict(kwargs)
+        config.update(
+            username=username,
+            password=password,
+            client_id=client_id,
+            client_secret=client_secret,
+        )
+        requestor_kwargs = config.setdefault("requestor_kwargs", {})
+        requestor_kwargs["session"] = session
+        config.setdefault("user_agent", session.headers["User-Agent"])
+        return praw.Reddit(**config)
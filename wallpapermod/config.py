@@ -1,56 +1,209 @@
-import argparse, datetime, json, os, pathlib, re
-
-import configargparse
+import argparse, datetime, functools, os, pathlib, re, sys
 
 from .const import *
 
 
+_DEFAULTING_NARGS = frozenset((argparse.OPTIONAL, argparse.ZERO_OR_MORE))
+
+_HELP_FLAGS = frozenset(("--help", "-h", "-?"))
+
+
 class ArgumentDefaultsHelpFormatter(argparse.ArgumentDefaultsHelpFormatter):
     def __init__(self, prog, indent_increment=2, max_help_position=80, width=None):
         super().__init__(prog, indent_increment, max_help_position, width)
 
     def _split_lines(self, text, width):
-        lines = text.splitlines()
         # The textwrap module is used only for formatting help.
         # Delay its import for speeding up the common usage of argparse.
         import textwrap
 
-        wrapped_lines = list()
-        for line in lines:
-            wrapped_lines.extend(textwrap.wrap(line, width))
-        return wrapped_lines
+        return [wrapped for line in text.splitlines() for wrapped in textwrap.wrap(line, width)]
 
     def _get_help_string(self, action):
         help = action.help
+        if help is None or "%(default)" in help:
+            return help
         if not (action.default is None and action.required and action.type is None):
-            if "%(default)" not in action.help:
-                if action.default is not argparse.SUPPRESS:
-                    defaulting_nargs = [argparse.OPTIONAL, argparse.ZERO_OR_MORE]
-                    if action.option_strings or action.nargs in defaulting_nargs:
-                        help += "\n(default: %(default)s)"
+            if action.default is not argparse.SUPPRESS:
+                if action.option_strings or action.nargs in _DEFAULTING_NARGS:
+                    help += "\n(default: %(default)s)"
         return help
 
 
+class ConfigFileArgumentParser(argparse.ArgumentParser):
+    """
+    An ArgumentParser that also reads settings from a YAML config file
+
+    The argument added with is_config_file=True names the file. Each `key: value` in it is passed
+    as if `--key=value` had been given on the command line, unless that option already was.
+    """
+
+    _config_file_action: t.Optional[argparse.Action] = None
+
+    def add_argument(self, *args, is_config_file: bool = False, **kwargs):
+        action = super().add_argument(*args, **kwargs)
+        if is_config_file:
+            self._config_file_action = action
+        return action
+
+    def parse_known_args(self, args=None, namespace=None):
+        args = sys.argv[1:] if args is None else list(args)
+        # Help doesn't need the config file, and shouldn't fail because of it
+        if self._config_file_action is not None and _HELP_FLAGS.isdisjoint(args):
+            config_args = self._config_file_args(args)
+            prefixes = tuple(self.prefix_chars)
+            # In front of everything, so the settings never split up the positional arguments,
+            # unless a list value would then swallow the positional arguments that follow it
+            insert_at = 0
+            if config_args and not config_args[-1].startswith(prefixes):
+                if args and not args[0].startswith(prefixes):
+                    insert_at = next(
+                        (i for i, arg in enumerate(args) if arg.startswith(prefixes)), len(args)
+                    )
+            args[insert_at:insert_at] = config_args
+        return super().parse_known_args(args, namespace)
+
+    def _config_file_args(self, args: list[str]) -> list[str]:
+        # Only imported once a config file is actually read, since it takes a while to import
+        import yaml
+
+        path = self._config_file_path(args)
+        if not path:
+            return []
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                settings = yaml.safe_load(file)
+        except OSError as exc:
+            self.error(f"Unable to open config file: {path}. Error: {exc}")
+        except yaml.YAMLError as exc:
+            self.error(f"Couldn't parse config file: {exc}")
+        if not isinstance(settings, dict):
+            self.error(f"Config file {path} doesn't contain a YAML mapping of 'key: value' pairs")
+
+        actions = {
+            option[2:]: action
+            for action in self._actions
+            for option in action.option_strings
+            if option.startswith(2 * self.prefix_chars)
+        }
+        given = {arg.split("=", 1)[0] for arg in args}
+        list_args = list[str]()
+        config_args = list[str]()
+        for key, value in settings.items():
+            action = actions.get(key)
+            if value is None or (action is not None and given.intersection(action.option_strings)):
+                continue
+            setting_args = self._config_setting_args(key, value, action)
+            if all(arg.startswith(tuple(self.prefix_chars)) for arg in setting_args):
+                config_args.extend(setting_args)
+            else:
+                # Options followed by a list of values go first, so the next option ends the list
+                list_args.extend(setting_args)
+        return list_args + config_args
+
+    def _config_file_path(self, args: list[str]) -> t.Optional[str]:
+        # A throwaway parser that only knows the config file option picks it out of the arguments
+        parser = argparse.ArgumentParser(
+            prefix_chars=self.prefix_chars, add_help=False, exit_on_error=False
+        )
+        parser._add_action(self._config_file_action)
+        try:
+            namespace, _ = parser.parse_known_args(args)
+        except argparse.ArgumentError:
+            # Reported properly once the full parser sees the same arguments
+            return None
+        return getattr(namespace, self._config_file_action.dest, None)
+
+    def _config_setting_args(
+        self, key: str, value: t.Any, action: t.Optional[argparse.Action]
+    ) -> list[str]:
+        if action is None:
+            # Unknown settings are left for argparse to reject like any unrecognized argument
+            option = 2 * self.prefix_chars[0] + key
+            values = value if isinstance(value, list) else [value]
+            return [f"{option}={v}" for v in values]
+
+        option = action.option_strings[-1]
+        if action.nargs == 0:
+            # A flag, e.g. store_true or count
+            value = str(value).lower()
+            if value in ("true", "yes", "on", "1"):
+                return [option]
+            if value in ("false", "no", "off", "0"):
+                return []
+            if isinstance(action, argparse._CountAction) and value.isdigit():
+                return [option] * int(value)
+            self.error(f"Unexpected value for {key}: {value!r}. Expecting true or false")
+        if isinstance(value, list):
+            if action.nargs in (argparse.ONE_OR_MORE, argparse.ZERO_OR_MORE) or (
+                isinstance(action.nargs, int) and action.nargs > 1
+            ):
+                return [option, *map(str, value)]
+            self.error(f"{key} can't be set to a list {value!r}")
+        return [f"{option}={value}"]
+
+
+@functools.cache
+def _abs_cwd() -> str:
+    # The working directory doesn't change while arguments are being parsed
+    return os.path.realpath(os.getcwd())
+
+
 def _relative_path(path: t.Union[str, pathlib.Path]) -> str:
-    abs_path = pathlib.Path(path).resolve()
-    abs_cwd = pathlib.Path(os.getcwd()).resolve()
-    return str(pathlib.Path(pathlib.PurePath(abs_path).relative_to(abs_cwd)))
+    rel_path = os.path.relpath(os.path.realpath(path), _abs_cwd())
+    if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+        raise ValueError(f"{str(path)!r} is not inside the working directory")
+    return rel_path
+
+
+@functools.cache
+def _resolve_default_config() -> str:
+    for dp_name in DEFAULT_CONFIG_PATHS:
+        if os.path.isfile(dp_name):
+            return _relative_path(dp_name)
+    raise argparse.ArgumentTypeError(
+        f"Config file is required; no default config files exist ({DEFAULT_CONFIG_PATHS})"
+    )
 
 
 def _config_path(path: str) -> pathlib.Path:
     if isinstance(path, _defaultconfigstr):
-        for dp_name in DEFAULT_CONFIG_PATHS:
-            dp = pathlib.Path(dp_name)
-            if dp.exists() and dp.is_file():
-                return _relative_path(dp)
-        raise ValueError(
-            f"Config file is required; no default config files exist ({DEFAULT_CONFIG_PATHS})"
-        )
+        return _resolve_default_config()
     return _relative_path(path)
 
 
+_SUBREDDIT_PREFIX_PATTERN = re.compile(r"^/?r/")
+
+_DATETIME_PATTERN = re.compile(
+    r"""
+    (?:             # Optional year
+        (\d{4})     # First group: YYYY year
+        \s*[-_/.,]\s*
+    )?
+    (\d{1,2})       # Second group: MM month
+    \s*[-_/.,]\s*
+    (\d{1,2})       # Third group: DD day
+    (?:
+        [\s,]\s*         # Mandatory separator between date and time
+        (\d{1,2})   # Fourth group: H[H] hour
+        \s*[-_:.,]\s*
+        (\d{2})     # Fifth group: MM minute
+        (?:
+            \s*[-_:.,]\s*
+            (\d{2}) # Sixth group: SS seconds
+        )? # Optional seconds
+    )? # Optional time
+""",
+    re.VERBOSE | re.IGNORECASE,
+)
+
+_DATE_SEPARATORS = frozenset("-_/.,")
+
+_POST_ID_PATTERN = re.compile(r"[a-z0-9]+", re.IGNORECASE)
+
+
 def _subredditstr(name: str) -> str:
-    return re.sub(r"^/?r/", "", name)
+    return _SUBREDDIT_PREFIX_PATTERN.sub("", name)
 
 
 class _defaultconfigstr(str):
@@ -62,6 +215,9 @@ class _defaultconfigstr(str):
 
 
 class _maskedstr(str):
+    # No per-instance __dict__; the secret is only ever held as the str itself
+    __slots__ = ()
+
     def __repr__(self):
         return "********"
 
@@ -69,29 +225,20 @@ class _maskedstr(str):
 def _postid_or_datetime(value: str) -> t.Union[str, datetime.datetime]:
     value = value.strip()
 
-    match = re.fullmatch(
-        r"""
-        (?:             # Optional year
-            (\d{4})     # First group: YYYY year
-            \s*[-_/.,]\s*
-        )?
-        (\d{1,2})       # Second group: MM month
-        \s*[-_/.,]\s*
-        (\d{1,2})       # Third group: DD day
-        (?:
-            [\s,]\s*         # Mandatory separator between date and time
-            (\d{1,2})   # Fourth group: H[H] hour
-            \s*[-_:.,]\s*
-            (\d{2})     # Fifth group: MM minute
-            (?:
-                \s*[-_:.,]\s*
-                (\d{2}) # Sixth group: SS seconds
-            )? # Optional seconds
-        )? # Optional time
-    """,
-        value,
-        re.VERBOSE | re.IGNORECASE,
-    )
+    # Fast path for ISO 8601 timestamps. Requiring a dash keeps all-digit post IDs from being read as
+    # basic-format dates like 20240115, and "." or "," are left to the pattern below, which treats
+    # them as separators rather than fractions (HH.MM, not HH.fraction)
+    if "-" in value and "." not in value and "," not in value:
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            pass
+
+    # Every timestamp has a separator between month and day, so post IDs can skip the pattern
+    if _DATE_SEPARATORS.isdisjoint(value):
+        match = None
+    else:
+        match = _DATETIME_PATTERN.fullmatch(value)
 
     if match:
         return datetime.datetime(
@@ -103,15 +250,25 @@ def _postid_or_datetime(value: str) -> t.Union[str, datetime.datetime]:
             int(match[6] or 0),
         )
 
-    match = re.fullmatch(r"[a-z0-9]+", value, re.IGNORECASE)
+    match = _POST_ID_PATTERN.fullmatch(value)
     if match:
         return value
 
     raise ValueError(f"{value!r} doesn't look like a timestamp or a post ID")
 
 
+def _json_loads(value: str) -> t.Any:
+    # orjson is optional; imported here rather than at the top since it's only needed while parsing
+    try:
+        import orjson as json
+    except ImportError:
+        import json
+
+    return json.loads(value)
+
+
 def _logging_config(value: str) -> dict:
-    cfg: dict = json.loads(value)
+    cfg: dict = _json_loads(value)
     cfg.setdefault("version", 1)
 
     return cfg
@@ -140,18 +297,27 @@ class Config(argparse.Namespace):
 
     @classmethod
     def create(cls) -> t.Self:
+        # --version doesn't need the parser, so answer it before building one, unless a help flag
+        # comes first and argparse would have shown help instead
+        args = sys.argv[1:]
+        if "--version" in args and _HELP_FLAGS.isdisjoint(args[: args.index("--version")]):
+            from wallpapermod import __version__
+
+            print("v" + __version__)
+            sys.exit(0)
+
         parser = cls.create_parser()
         return parser.parse_args(namespace=cls())
 
     @staticmethod
-    def create_parser() -> configargparse.ArgumentParser:
+    def create_parser() -> ConfigFileArgumentParser:
         from wallpapermod import __version__
 
-        parser = configargparse.ArgumentParser(
+        parser = ConfigFileArgumentParser(
             prog=APP_NAME,
             description="A moderator for the subreddit /r/wallpaper <https://www.reddit.com/r/wallpaper> that validates image sizes",
+            epilog="Options starting with '--' can also be set in the YAML config file, as 'key: value' without the dashes. Values given on the command line override the config file, which overrides the defaults.",
             formatter_class=ArgumentDefaultsHelpFormatter,
-            config_file_parser_class=configargparse.YAMLConfigFileParser,
             add_help=False,
         )
         parser.add_argument(
@@ -239,7 +405,7 @@ class Config(argparse.Namespace):
             "--praw",
             help="JSON-formatted extra kwargs for PRAW config <https://praw.readthedocs.io/en/stable/getting_started/configuration.html>",
             metavar="JSON",
-            type=json.loads,
+            type=_json_loads,
             dest="praw_config",
         )
 
@@ -296,15 +462,16 @@ class CLIConfig(Config):
 
     def print(self):
         configdict = vars(self)
-        longestklen = max(len(k) for k in configdict.keys())
-        for k, v in configdict.items():
-            print(f"{k:<{longestklen}} = {v!r}")
+        longestklen = max(map(len, configdict))
+        # Written in one go rather than a print() per line
+        sys.stdout.write("".join(f"{k:<{longestklen}} = {v!r}\n" for k, v in configdict.items()))
 
     @classmethod
-    def create_parser(cls) -> configargparse.ArgumentParser:
+    def create_parser(cls) -> ConfigFileArgumentParser:
         parser = super().create_parser()
 
-        other_grp = next(filter(lambda g: g.title == "other options", parser._action_groups))
+        groups = {group.title: group for group in parser._action_groups}
+        other_grp = groups["other options"]
         other_grp.add_argument(
             "--logging",
             "-l",
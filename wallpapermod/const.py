@@ -1,4 +1,4 @@
-import enum, typing as t
+import datetime, enum, typing as t
 
 
 Resolution = tuple[int, int]
@@ -8,6 +8,15 @@ APP_NAME = "wallpapermod"
 
 DB_NAME = "db.sqlite"
 
+# Number of processed posts between database commits
+COMMIT_INTERVAL = 50
+
+REZZES_CACHE_NAME = "rezzes_cache.json"
+REZZES_CACHE_TTL = datetime.timedelta(hours=24)
+
+MODERATORS_CACHE_NAME = "moderators_cache.json"
+MODERATORS_CACHE_TTL = datetime.timedelta(hours=6)
+
 DEFAULT_CONFIG_PATHS = ("config.yml", "config.yaml")
 
 
@@ -40,10 +49,29 @@ class ImageURLCollection(t.NamedTuple):
     special_type: str = None
 
 
-SUPPORTED_FORMATS = [
+class ImageHeader(t.NamedTuple):
+    content_type: t.Optional[str]
+    format: t.Optional[str] = None  # None if the image couldn't be identified
+    width: int = 0
+    height: int = 0
+
+
+# Concurrent image downloads per gallery, and connections kept alive per host
+GALLERY_WORKERS = 8
+HTTP_POOL_SIZE = 32
+
+# Images are downloaded in chunks of IMAGE_CHUNK_BYTES until their header can be parsed, asking the
+# server for the first IMAGE_RANGE_BYTES only. Anything PIL can't identify after
+# IMAGE_HEADER_MAX_BYTES is treated as an unsupported media type.
+IMAGE_CHUNK_BYTES = 16 * 1024
+IMAGE_RANGE_BYTES = 64 * 1024
+IMAGE_HEADER_MAX_BYTES = 1024 * 1024
+
+# A tuple rather than a set: PIL.Image.open only accepts a list or tuple for its formats argument
+SUPPORTED_FORMATS = (
     "BMP",
     "GIF",
     "JPEG",
     "PNG",
     "WEBP",
-]
+)
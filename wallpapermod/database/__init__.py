@@ -1,3 +1,5 @@
+import typing as t
+
 from sqlalchemy.schema import DropTable
 
 from .models import (
@@ -12,18 +14,43 @@ __all__ = [
     "Image",
     "drop_all",
     "create_all",
+    "save_all",
 ]
 
 
 def drop_all():
-    DB.execute(DropTable(Submission.__table__, if_exists=True))
-    DB.execute(DropTable(Image.__table__, if_exists=True))
-    DB.commit()
+    with DB.get_bind().begin() as cxn:
+        cxn.execute(DropTable(Image.__table__, if_exists=True))
+        cxn.execute(DropTable(Submission.__table__, if_exists=True))
 
 
 def create_all():
-    engine = DB.get_bind()
+    with DB.get_bind().begin() as cxn:
+        Submission.__table__.create(cxn, checkfirst=True)
+        Image.__table__.create(cxn, checkfirst=True)
+
+
+def save_all(submissions: t.Sequence[Submission]):
+    """
+    Insert new submissions and their images with one executemany INSERT per table, rather than
+    going through the session's unit of work object by object. The objects aren't added to the
+    session
+    """
+    images = [image for submission in submissions for image in submission.images]
+    for table, objs in ((Submission.__table__, submissions), (Image.__table__, images)):
+        if objs:
+            DB.execute(table.insert(), [_row(table, obj) for obj in objs])
+
 
-    Submission.__table__.create(engine)
-    Image.__table__.create(engine)
-    DB.commit()
+def _row(table, obj) -> dict[str, t.Any]:
+    # Every row needs the same keys, or the INSERT can't be batched, so unset columns are
+    # filled in with their defaults here instead of being left out
+    row = dict[str, t.Any]()
+    for column in table.columns:
+        if column.primary_key:
+            continue
+        value = getattr(obj, column.key)
+        if value is None and column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        row[column.key] = value
+    return row
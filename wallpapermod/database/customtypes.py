@@ -12,21 +12,15 @@ class Rezzes(types.TypeDecorator):
     cache_ok = True
 
     def process_bind_param(self, value: list[Resolution], dialect):
-        rezzes = list[str]()
-        for x, y, *_ in value:
-            rezzes.append(f"{x}x{y}")
-
-        return ",".join(rezzes)
+        return ",".join([f"{res[0]}x{res[1]}" for res in value])
 
     def process_result_value(self, value: str, dialect):
-        rezzes = list[Resolution]()
         if not value:
-            return rezzes
+            return list[Resolution]()
 
-        for res_str in str(value).split(","):
-            x, y, *_ = res_str.split("x")
-            rezzes.append((int(x), int(y)))
-        return rezzes
+        return [
+            (int(x), int(y)) for x, y in (res_str.split("x", 1) for res_str in value.split(","))
+        ]
 
 
 def ValueEnum(enum_: t.Type[enum.Enum]):
@@ -3,6 +3,7 @@ import typing as t
 from sqlalchemy import event
 from sqlalchemy.engine import create_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from wallpapermod.const import *
 
@@ -10,6 +11,9 @@ from wallpapermod.const import *
 class _SessionProxy:
     def __init__(self, filename: t.Optional[str] = None):
         self._session = scoped_session(sessionmaker(autocommit=False, autoflush=False))
+        # Bind the most used methods directly, so calling them skips __getattr__
+        for attr in ("add", "bulk_save_objects", "commit", "execute", "flush", "get_bind", "query"):
+            setattr(self, attr, getattr(self._session, attr))
         if filename is not None:
             self.configure(filename)
 
@@ -21,9 +25,28 @@ class _SessionProxy:
 
     @classmethod
     def create_engine(cls, filename: str):
-        engine = create_engine(f"sqlite:///{filename}")
-        event.listen(engine, "connect", lambda cxn, _: cxn.execute("pragma foreign_keys=ON"))
+        # Keep one connection open instead of SQLAlchemy 1.4's default NullPool for SQLite files,
+        # which reconnects (and replays the pragmas) on every checkout
+        engine = create_engine(
+            f"sqlite:///{filename}",
+            poolclass=QueuePool,
+            pool_size=1,
+            max_overflow=0,
+            connect_args={"check_same_thread": False},
+        )
+        event.listen(engine, "connect", cls._on_connect)
         return engine
 
+    @staticmethod
+    def _on_connect(cxn, _):
+        cxn.execute("pragma foreign_keys=ON")
+        # With a write-ahead log, commits no longer need to wait for an fsync of the database
+        cxn.execute("pragma journal_mode=WAL")
+        cxn.execute("pragma synchronous=NORMAL")
+        # 64 MiB page cache, in-memory temp tables, and up to 256 MiB of the file memory-mapped
+        cxn.execute("pragma cache_size=-64000")
+        cxn.execute("pragma temp_store=MEMORY")
+        cxn.execute("pragma mmap_size=268435456")
+
 
 DB = _SessionProxy()
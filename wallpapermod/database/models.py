@@ -1,4 +1,4 @@
-import datetime, re
+import datetime, functools, re
 
 import praw
 from sqlalchemy import (
@@ -13,32 +13,70 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 
+try:
+    import colorama
+except ImportError:
+    colorama = None
+
 from .base import Base
 from .customtypes import Rezzes, ValueEnum
 from wallpapermod.const import *
 
+_RES_PATTERN = re.compile(
+    r"""
+    (            # Capture group 1: Compulsory capture of the whole thing
+        [\[\(\{] # Opening bracket
+        \s?      # Optional whitespace char
+        ([0-9]+) # Capture group 2: width dimension
+        \s?      # Optional whitespace char
+        [x*×]    # x-like character
+        \s?      # Optional whitespace char
+        ([0-9]+) # Capture group 3: height dimension
+        \s?      # Optional whitespace char
+        [\]\)\}] # Closing bracket
+    )
+""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def _may_contain_res(title: str) -> bool:
+    """
+    Cheap check that rules out running _RES_PATTERN on titles without any opening bracket
+    """
+    return "[" in title or "(" in title or "{" in title
+
+
+@functools.lru_cache(maxsize=4096)
+def _title_to_res_pairs(title: str) -> tuple[Resolution, ...]:
+    """
+    The resolutions in a title. Cached, so a tuple is returned rather than a shared list
+    """
+    if not _may_contain_res(title):
+        return ()
+
+    return tuple((int(a), int(b)) for _, a, b in _RES_PATTERN.findall(title))
+
+
+@functools.lru_cache(maxsize=8)
+def _scale_map(known_good_rezzes: frozenset[Resolution]) -> dict[Resolution, int]:
+    """
+    Map every resolution that's 1, 2 or 3 known-good resolutions side by side to its scale,
+    so (w, h) has scale s if (w // s, h) is known-good, preferring the lowest such s
+    """
+    scales = dict[Resolution, int]()
+    # Lowest scale last, so it wins
+    for scale in range(3, 0, -1):
+        for gw, gh in known_good_rezzes:
+            for remainder in range(scale):
+                scales[(gw * scale + remainder, gh)] = scale
+    return scales
+
 
 class Submission(Base):
     __tablename__ = "submissions"
     __table_args__ = (Index("idx_u_submissions_postID", "postID", unique=True),)
 
-    _res_pattern = re.compile(
-        r"""
-        (            # Capture group 1: Compulsory capture of the whole thing
-            [\[\(\{] # Opening bracket
-            \s?      # Optional whitespace char
-            ([0-9]+) # Capture group 2: width dimension
-            \s?      # Optional whitespace char
-            [x*×]    # x-like character
-            \s?      # Optional whitespace char
-            ([0-9]+) # Capture group 3: height dimension
-            \s?      # Optional whitespace char
-            [\]\)\}] # Closing bracket
-        )
-    """,
-        re.IGNORECASE | re.VERBOSE,
-    )
-
     id = Column(Integer, primary_key=True)
     postID = Column(Text, nullable=False)
     title = Column(Text, nullable=False)
@@ -48,73 +86,56 @@ class Submission(Base):
     dateSubmitted = Column(DateTime, nullable=False)
     dateProcessed = Column(DateTime, nullable=False)
     domain = Column(Text, nullable=False)
-    removed = Column(Boolean, nullable=False, server_default=text("0"))
+    removed = Column(Boolean, nullable=False, default=False, server_default=text("0"))
     result = Column(ValueEnum(PostResult), nullable=False)
     response = Column(Text, nullable=True)
     type = Column(ValueEnum(PostType), nullable=False, default=PostType.UNKNOWN)
     title_tokens: list["_TitleToken"]
-    good_rezzes: set[Resolution]
+    good_rezzes: frozenset[Resolution]
 
     def parse_title(self, known_good_rezzes: t.Iterable[Resolution]):
         """
-        Parses the title and populates self.title_tokens and self.res
+        Parses the title and populates self.title_tokens, self.res and self.good_rezzes
         """
         rezzes = list[Resolution]()
         good_rezzes = set[Resolution]()
         title_tokens = list["_TitleToken"]()
-        match = re.split(self._res_pattern, self.title)
-
-        if len(match) == 1:
-            title_tokens.append(_TitleToken(match[0]))
-        elif (len(match) - 1) % 4 == 0:
-            # There are 1+4n elements in the list, where n is the number of resolutions found.
-
-            # The first element is always plain text (even if it's an empty string)
-            plaintext = match.pop(0)
-            if plaintext:
-                # Only append if it's not the empty string
-                title_tokens.append(_TitleToken(plaintext))
-
-            # The 2nd, 6th, 10th, etc. element is always the full resolution string, e.g. "[1920x1080]"
-            # The 3rd, 7th, 11th, etc. element is always the width resolution string, e.g. "1920"
-            # The 4th, 8th, 12th, etc. element is always the height resolution string, e.g. "1080"
-            # The 5th, 9th, 13th, etc. element is always plain text (even if it's an empty string)
-            while len(match):
-                res_str = match.pop(0)
-                w = int(match.pop(0))
-                h = int(match.pop(0))
-                plaintext = match.pop(0)
-
-                rezzes.append((w, h))
-
-                # Calculate "scale" of resolution. 0 is a bad resolution, 1 is normal, 2 is dual monitor, 3 is triple monitor
-                for scale in range(1, 4):
-                    if (w // scale, h) in known_good_rezzes:
-                        title_tokens.append(_TitleToken(res_str, w, h, scale))
-                        good_rezzes.add((w, h))
-                        break
-                else:
-                    title_tokens.append(_TitleToken(res_str, w, h, 0))
-
-                # Only append the plaintext if it's not the empty string
-                if plaintext:
-                    title_tokens.append(_TitleToken(plaintext))
+        scales = _scale_map(frozenset(known_good_rezzes))
+
+        pos = 0
+        matches = _RES_PATTERN.finditer(self.title) if _may_contain_res(self.title) else ()
+        for match in matches:
+            # Only append the plaintext before each resolution if it's not the empty string
+            if match.start() > pos:
+                title_tokens.append(_TitleToken(self.title[pos : match.start()]))
+            pos = match.end()
+
+            res_str = match[1]
+            w = int(match[2])
+            h = int(match[3])
+
+            rezzes.append((w, h))
+
+            # Calculate "scale" of resolution. 0 is a bad resolution, 1 is normal, 2 is dual monitor, 3 is triple monitor
+            scale = scales.get((w, h), 0)
+            title_tokens.append(_TitleToken(res_str, w, h, scale))
+            if scale:
+                good_rezzes.add((w, h))
+
+        # The title always yields at least one token, even if it's empty
+        if pos < len(self.title) or not title_tokens:
+            title_tokens.append(_TitleToken(self.title[pos:]))
 
         self.res = rezzes
         self.title_tokens = title_tokens
-        self.good_rezzes = good_rezzes
+        self.good_rezzes = frozenset(good_rezzes)
 
     def pretty_title(self) -> str:
-        return "".join(str(token) for token in self.title_tokens)
+        return "".join([token.render() for token in self.title_tokens])
 
     @classmethod
     def title_to_res_pairs(cls, title: str):
-        matches = re.findall(cls._res_pattern, title)
-        rezzes = list[Resolution]()
-        for a, b, *_ in matches:
-            rezzes.append((int(a), int(b)))
-
-        return rezzes
+        return list(_title_to_res_pairs(title))
 
     @classmethod
     def from_post(cls, post: praw.reddit.Submission, known_good_rezzes: t.Iterable[Resolution]):
@@ -150,6 +171,8 @@ class Image(Base):
 
 
 class _TitleToken:
+    __slots__ = ("value", "width", "height", "scale")
+
     def __init__(
         self,
         value: str,
@@ -162,13 +185,11 @@ class _TitleToken:
         self.height = height
         self.scale = scale
 
-    def __str__(self) -> str:
-        try:
-            import colorama
-        except:
-            return self.value
-
-        if self.scale is None:
+    def render(self) -> str:
+        """
+        The token's text, colored by its scale if it's a resolution and colorama is available
+        """
+        if colorama is None or self.scale is None:
             return self.value
 
         if self.scale <= 0:
@@ -179,3 +200,5 @@ class _TitleToken:
             return colorama.Fore.BLUE + self.value + colorama.Style.RESET_ALL
 
         raise ValueError(f"Unknown scale {self.scale!r}")
+
+    __str__ = render
@@ -12,3 +12,7 @@ class PostResultError(WallpapermodError):
 
 class WrongSubredditError(WallpapermodError):
     pass
+
+
+class PostNotFoundError(WallpapermodError):
+    pass
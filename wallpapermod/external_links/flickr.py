@@ -4,12 +4,14 @@ import requests
 
 
 class Flickr:
+    _PHOTO_URL_PATTERN = re.compile(r".*?/photos/[@a-z0-9]+/(\d+)/?", re.IGNORECASE)
+
     def __init__(self, key: str, session: requests.Session = None):
         self.key = key
         self.session = session or requests.Session()
 
     def get_image_urls(self, url: str) -> t.Union[str, list[str]]:
-        if match := re.fullmatch(r".*?/photos/[@a-z0-9]+/(\d+)/?", url, re.IGNORECASE):
+        if match := self._PHOTO_URL_PATTERN.fullmatch(url):
             return self._get_single_image_url(match[1])
 
         raise ValueError(f"Unable to parse Flickr URL {url!r}")
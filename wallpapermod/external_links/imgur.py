@@ -1,9 +1,17 @@
 import re, typing as t
+from urllib.parse import urlparse
 
 import requests
 
 
 class Imgur:
+    # Matched against the URL's path only
+    _ALBUM_URL_PATTERN = re.compile(r"(?:/[^/]*)*?/a/([a-z0-9]+)(?:\.[a-z0-9]+)?", re.IGNORECASE)
+    _TAG_URL_PATTERN = re.compile(
+        r"(?:/[^/]*)*?/t/[^/]+/([a-z0-9]+)(?:\.[a-z0-9]+)?", re.IGNORECASE
+    )
+    _IMAGE_URL_PATTERN = re.compile(r"(?:/[^/]*)*/([a-z0-9]+)(?:\.[a-z0-9]+)?", re.IGNORECASE)
+
     def __init__(self, client_id: str, session: requests.Session = None):
         self.client_id = client_id
         # self.client_secret = client_secret
@@ -14,13 +22,15 @@ class Imgur:
         return {"Authorization": f"Client-ID {self.client_id}"}
 
     def get_image_urls(self, url: str) -> t.Union[str, list[str]]:
-        if match := re.fullmatch(r".*?/a/([a-z0-9]+)(?:\.[a-z0-9]+)?", url, re.IGNORECASE):
+        path = urlparse(url).path
+
+        if match := self._ALBUM_URL_PATTERN.fullmatch(path):
             return self._get_album_image_urls(match[1])
 
-        if match := re.fullmatch(r".*?/t/[^/]+/([a-z0-9]+)(?:\.[a-z0-9]+)?", url, re.IGNORECASE):
+        if match := self._TAG_URL_PATTERN.fullmatch(path):
             return self._get_album_image_urls(match[1])
 
-        if match := re.fullmatch(r".*?/([a-z0-9]+)(?:\.[a-z0-9]+)?", url, re.IGNORECASE):
+        if match := self._IMAGE_URL_PATTERN.fullmatch(path):
             return self._get_single_image_url(match[1])
 
         raise ValueError(f"Unable to parse Imgur URL {url!r}")
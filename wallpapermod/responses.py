@@ -1,4 +1,4 @@
-import textwrap
+import functools, textwrap
 
 from .const import *
 from .database import Submission
@@ -65,31 +65,63 @@ class Responder:
         }
     )
 
+    # Used instead of responses[PostResult.SMALLER] when there's one image and one title resolution
+    explicit_smaller_response = """
+        **Your post has been removed** - The resolution of your image ({image_x} x {image_y}) doesn't match the resolution you put in the title of your post ({res_x} x {res_y}).
+        This makes it harder for folks searching for their preferred resolution.
+        In the future, please inspect your image so the correct resolution is in your post, or crop/resize your image before posting it.
+
+        Images must be one of the accepted resolutions [available on the wiki](/r/wallpaper/wiki/resolutions).
+        /r/wallpaper requires an *exact* horizontal desktop resolution - simply having an appropriate aspect ratio (like 16:9 or 16:10) is not good enough!
+
+        For mobile wallpapers, please visit /r/MobileWallpaper, /r/mobilewallpapers, /r/Verticalwallpapers, /r/WallpapersiPhone, or /r/iWallpaper instead.
+    """
+
+    # Wrapped versions of the above, filled in by _wrap_templates()
+    templates: dict[PostResult, str]
+    explicit_smaller_template: str
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._wrap_templates()
+
     def __init__(self, subreddit: str):
         self.subreddit = _subredditstr(subreddit)
 
+        # Fill in the subreddit now, leaving only the per-submission fields to format
+        escaped = self.subreddit.replace("{", "{{").replace("}", "}}")
+        self.templates = {
+            result: msg.replace("{subreddit}", escaped) for result, msg in self.templates.items()
+        }
+        self.explicit_smaller_template = self.explicit_smaller_template.replace(
+            "{subreddit}", escaped
+        )
+
     def make_response(self, submission: Submission) -> t.Optional[str]:
         assert isinstance(submission.result, PostResult)
-        if submission.result not in self.responses:
+        msg = self.templates.get(submission.result)
+        if msg is None:
             return None
 
+        fields = {
+            "author": submission.author,
+            "permalink": submission.permalink,
+            "reason": submission.result.name,
+        }
         if (
             submission.result is PostResult.SMALLER
             and len(submission.res) == 1
             and len(submission.images) == 1
         ):
-            msg = self._make_response_explicit_smaller(submission)
-        else:
-            msg = self.responses[submission.result]
+            msg = self.explicit_smaller_template
+            fields.update(
+                image_x=submission.images[0].x,
+                image_y=submission.images[0].y,
+                res_x=submission.res[0][0],
+                res_y=submission.res[0][1],
+            )
 
-        msg = self.wrap(msg)
-
-        return msg.format(
-            author=submission.author,
-            permalink=submission.permalink,
-            reason=submission.result.name,
-            subreddit=self.subreddit,
-        )
+        return msg.format_map(fields)
 
     @classmethod
     def wrap(cls, msg: str) -> str:
@@ -98,15 +130,21 @@ class Responder:
         footer = textwrap.dedent(cls.footer).strip()
         return f"{header}\n\n{msg}\n\n{footer}"
 
-    @staticmethod
-    def _make_response_explicit_smaller(submission: Submission) -> str:
-        return f"""
-            **Your post has been removed** - The resolution of your image ({submission.images[0].x} x {submission.images[0].y}) doesn't match the resolution you put in the title of your post ({submission.res[0][0]} x {submission.res[0][1]}).
-            This makes it harder for folks searching for their preferred resolution.
-            In the future, please inspect your image so the correct resolution is in your post, or crop/resize your image before posting it.
+    @classmethod
+    def _wrap_templates(cls):
+        """
+        Wrap every response once, when the class is defined, so make_response only formats them
+        """
+        cls.templates = {result: cls.wrap(msg) for result, msg in cls.responses.items()}
+        cls.explicit_smaller_template = cls.wrap(cls.explicit_smaller_response)
+
 
-            Images must be one of the accepted resolutions [available on the wiki](/r/wallpaper/wiki/resolutions).
-            /r/wallpaper requires an *exact* horizontal desktop resolution - simply having an appropriate aspect ratio (like 16:9 or 16:10) is not good enough!
+Responder._wrap_templates()
 
-            For mobile wallpapers, please visit /r/MobileWallpaper, /r/mobilewallpapers, /r/Verticalwallpapers, /r/WallpapersiPhone, or /r/iWallpaper instead.
-        """
+
+@functools.lru_cache(maxsize=16)
+def get_responder(subreddit: str) -> Responder:
+    """
+    A shared Responder for the subreddit, so its templates are only prepared once
+    """
+    return Responder(subreddit)
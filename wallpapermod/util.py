@@ -1,4 +1,4 @@
-import collections.abc, typing as t
+import collections.abc, json, pathlib, typing as t
 
 
 def count(
@@ -11,3 +11,21 @@ def count(
         plural = singular + "s"
 
     return f"{n} {singular if n == 1 else plural}"
+
+
+def read_json(path: t.Union[str, pathlib.Path]) -> t.Any:
+    """
+    Load a JSON file, returning None if it doesn't exist or can't be decoded
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: t.Union[str, pathlib.Path], data: t.Any):
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file)